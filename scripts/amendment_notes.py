@@ -0,0 +1,89 @@
+#!/usr/bin/env python3
+"""
+Amendment notes - extracts structured modification notes such as "(Değişik: 25/5/2005 – 5353/15 md.)" from law text.
+"""
+
+import re
+from typing import Dict, List
+
+# "(Değişik birinci cümle: 24/11/2016-6763/34 md.)", "(Mülga: 2/7/2012-6352/105 md.)"
+AMENDMENT_NOTE_PATTERN = re.compile(
+    r'\(\s*(Değişik|Ek|Mülga|İptal|Yeniden Düzenleme)([^:()]*):\s*([^()]*)\)(\s*\[\d+\])?',
+    re.IGNORECASE | re.UNICODE
+)
+DATE_PATTERN = re.compile(r'(\d{1,2})/(\d{1,2})/(\d{4})')
+LAW_PATTERN = re.compile(r'((?:KHK\s*-\s*)?\d+)\s*/\s*(\d+)\s*md', re.IGNORECASE)
+APPROVAL_PATTERN = re.compile(r'^\s*Aynen kabul\s*:', re.IGNORECASE)
+
+
+def fold_turkish(text: str) -> str:
+    """Case-fold Turkish text so that İ/I/ı/i all compare equal."""
+    return text.lower().replace('\u0307', '').replace('ı', 'i')
+
+
+AMENDMENT_KINDS = {fold_turkish(kind): kind for kind in ('Değişik', 'Ek', 'Mülga', 'İptal', 'Yeniden Düzenleme')}
+
+
+def _parse_date(text: str) -> str:
+    match = DATE_PATTERN.search(text)
+    if not match:
+        return ''
+    day, month, year = match.groups()
+    return f"{year}-{int(month):02d}-{int(day):02d}"
+
+
+def _parse_law(text: str) -> Dict[str, str]:
+    match = LAW_PATTERN.search(text)
+    if not match:
+        return {'law': '', 'section': ''}
+    return {'law': re.sub(r'\s+', '', match.group(1)), 'section': match.group(2)}
+
+
+def parse_amendment_notes(text: str) -> List[Dict]:
+    """Extract the amendment notes in a text as structured entries."""
+    notes = []
+    for match in AMENDMENT_NOTE_PATTERN.finditer(text):
+        clauses = match.group(3).split(';')
+        law = _parse_law(clauses[0])
+        note = {
+            'kind': AMENDMENT_KINDS.get(fold_turkish(match.group(1)), match.group(1)),
+            'scope': match.group(2).strip(),
+            'date': _parse_date(clauses[0]),
+            'law': law['law'],
+            'section': law['section'],
+            'note': match.group(0).strip()
+        }
+        # Decree laws (KHK) are later approved by a law, "Aynen kabul: 1/2/2018-7072/8 md."
+        for clause in clauses[1:]:
+            if APPROVAL_PATTERN.match(clause):
+                note['approvalDate'] = _parse_date(clause)
+                note['approvalLaw'] = _parse_law(clause)['law']
+        notes.append(note)
+    return notes
+
+
+def strip_amendment_notes(text: str) -> str:
+    """Remove amendment notes and their footnote markers from display text."""
+    stripped = AMENDMENT_NOTE_PATTERN.sub('', text)
+    return '\n'.join(re.sub(r'[ \t]{2,}', ' ', line).strip() for line in stripped.split('\n'))
+
+
+def build_amendment_index(notes_by_article: Dict[str, List[Dict]]) -> Dict:
+    """Index amendment notes by article key and by amending law."""
+    by_article = {}
+    by_law = {}
+
+    for key in sorted(notes_by_article):
+        notes = notes_by_article[key]
+        if not notes:
+            continue
+        by_article[key] = notes
+        for note in notes:
+            for law in (note['law'], note.get('approvalLaw', '')):
+                if law and key not in by_law.setdefault(law, []):
+                    by_law[law].append(key)
+
+    return {
+        'byArticle': by_article,
+        'byLaw': {law: by_law[law] for law in sorted(by_law)}
+    }
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Atomic file output - writes via temp file and rename, skipping writes when bytes are unchanged.
+"""
+
+import json
+import os
+import tempfile
+from typing import Any
+
+
+def write_text_if_changed(path: str, text: str) -> bool:
+    """Atomically write text to path unless the file already has the same bytes.
+
+    Returns True if the file was written.
+    """
+    data = text.encode('utf-8')
+
+    try:
+        with open(path, 'rb') as f:
+            if f.read() == data:
+                return False
+    except OSError:
+        pass
+
+    directory = os.path.dirname(path) or '.'
+    os.makedirs(directory, exist_ok=True)
+    fd, tmp_path = tempfile.mkstemp(dir=directory, prefix='.tmp-', suffix=os.path.basename(path))
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        # mkstemp creates the file as 0600, keep the usual permissions instead
+        os.chmod(tmp_path, os.stat(path).st_mode if os.path.exists(path) else 0o644)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+    return True
+
+
+def canonical_json(data: Any) -> str:
+    """Serialize data as JSON with top-level dictionary keys sorted."""
+    if isinstance(data, dict):
+        data = {key: data[key] for key in sorted(data)}
+    return json.dumps(data, ensure_ascii=False, indent=2)
+
+
+def write_json_if_changed(path: str, data: Any) -> bool:
+    """Atomically write canonical JSON to path unless it is unchanged."""
+    return write_text_if_changed(path, canonical_json(data))
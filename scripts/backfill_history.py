@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+History backfill - parses archived, dated law HTML snapshots in parallel and replays them into the content tracker.
+
+Snapshots are expected as one directory per date, named with an ISO date or
+datetime, each holding `<LAW>.html` files:
+
+    snapshots/2023-11-02/CMK.html
+    snapshots/2024-06-18T09:30:00/CMK.html
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime
+from typing import Dict, List, Optional, Tuple
+
+from content_tracker import ContentTracker
+from law_parser import parse_html_file
+
+
+def parse_snapshot_timestamp(name: str) -> Optional[str]:
+    """Convert a snapshot directory name to an ISO timestamp, or None if it is not a date."""
+    try:
+        dt = datetime.fromisoformat(name.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if dt.tzinfo is not None:
+        dt = dt.replace(tzinfo=None) - dt.utcoffset()
+    return dt.isoformat() + 'Z'
+
+
+def find_snapshot_files(snapshot_dir: str) -> List[Tuple[str, str]]:
+    """List (timestamp, file_path) pairs for every HTML file in the dated snapshot directories."""
+    files = []
+    for name in sorted(os.listdir(snapshot_dir)):
+        dated_dir = os.path.join(snapshot_dir, name)
+        timestamp = parse_snapshot_timestamp(name)
+        if timestamp is None or not os.path.isdir(dated_dir):
+            print(f"Skipping {dated_dir}: not a dated snapshot directory")
+            continue
+        for filename in sorted(os.listdir(dated_dir)):
+            if filename.endswith('.html'):
+                files.append((timestamp, os.path.join(dated_dir, filename)))
+    return files
+
+
+def parse_snapshots(files: List[Tuple[str, str]], workers: Optional[int] = None) -> List[Tuple[str, List[Dict]]]:
+    """Parse snapshot files across a process pool and group the articles by timestamp."""
+    by_timestamp = {}
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        file_paths = [file_path for _, file_path in files]
+        for (timestamp, file_path), articles in zip(files, executor.map(parse_html_file, file_paths)):
+            print(f"Parsed {file_path}: {len(articles)} articles")
+            for article in articles:
+                article['sourceUrl'] = f"https://www.mevzuat.gov.tr/mevzuat?MevzuatNo={article['code']}"
+            by_timestamp.setdefault(timestamp, []).extend(articles)
+    return sorted(by_timestamp.items())
+
+
+def backfill(snapshot_dir: str, history_file: str, workers: Optional[int] = None) -> Dict[str, int]:
+    """Rebuild content history from dated snapshots in one batch."""
+    files = find_snapshot_files(snapshot_dir)
+    snapshots = parse_snapshots(files, workers)
+
+    tracker = ContentTracker(history_file=history_file)
+    counts = tracker.record_snapshots(snapshots)
+
+    print("\n" + "=" * 60)
+    print(f"Replayed {len(snapshots)} snapshots from {len(files)} files into {history_file}")
+    print(f"New: {counts['new']}, Modified: {counts['modified']}, "
+          f"Unchanged: {counts['unchanged']}")
+    print(f"Past versions backfilled: {counts['backfilled']}, "
+          f"Skipped (no longer in the corpus): {counts['skipped']}")
+
+    return counts
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Backfill law content history from dated HTML snapshots')
+    parser.add_argument('snapshot_dir',
+                        help='Directory containing one sub-directory per snapshot date')
+    parser.add_argument('--history-file', default='../src/data/generated/law_content_history.json',
+                        help='Content history file to update')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='Number of parser processes (defaults to CPU count)')
+    args = parser.parse_args()
+
+    backfill(args.snapshot_dir, args.history_file, args.workers)
+
+
+if __name__ == "__main__":
+    main()
@@ -9,6 +9,9 @@ import os
 from datetime import datetime
 from typing import Dict, List, Tuple, Optional
 
+from atomic_io import write_json_if_changed
+from impact_index import impacted_phases, impacted_questions
+
 class ContentTracker:
     def __init__(self, history_file: str = "content_history.json"):
         self.history_file = history_file
@@ -25,9 +28,8 @@ class ContentTracker:
         return {}
     
     def _save_history(self):
-        """Save content history to file."""
-        with open(self.history_file, 'w', encoding='utf-8') as f:
-            json.dump(self.history, f, ensure_ascii=False, indent=2)
+        """Save content history to file, leaving it untouched when nothing changed."""
+        write_json_if_changed(self.history_file, self.history)
     
     def generate_checksum(self, content: str) -> str:
         """Generate SHA-256 checksum for content."""
@@ -38,11 +40,12 @@ class ContentTracker:
         return f"{code}:{article}"
     
     def track_article(self, code: str, article: str, content: str, 
-                     title: str = "", source_url: str = "") -> Dict:
-        """Track an article and detect changes."""
+                     title: str = "", source_url: str = "",
+                     timestamp: Optional[str] = None) -> Dict:
+        """Track an article and detect changes, optionally as of a past timestamp."""
         key = self.get_article_key(code, article)
         checksum = self.generate_checksum(content)
-        now = datetime.utcnow().isoformat() + 'Z'
+        now = timestamp or datetime.utcnow().isoformat() + 'Z'
         
         # Check if article exists in history
         if key in self.history:
@@ -118,7 +121,7 @@ class ContentTracker:
             changes[result['status']].append(article_info)
         
         # Check for removed articles
-        for key in self.history:
+        for key in sorted(self.history):
             if key not in current_keys:
                 parts = key.split(':', 1)
                 if len(parts) == 2:
@@ -134,33 +137,123 @@ class ContentTracker:
         
         return changes
     
+    def _record_past_version(self, key: str, checksum: str, timestamp: str, known_until: str) -> str:
+        """Merge a version seen at a past timestamp into an article's chronological history."""
+        entry = self.history[key]
+        versions = entry.get('previous_checksums', []) + [
+            {'checksum': entry['checksum'], 'lastUpdated': entry['lastUpdated']}
+        ]
+        # The version that was current at the timestamp, -1 if it predates them all
+        index = max((i for i, version in enumerate(versions) if version['lastUpdated'] <= timestamp), default=-1)
+        entry['firstSeen'] = min(entry.get('firstSeen', timestamp), timestamp)
+
+        if index >= 0 and versions[index]['checksum'] == checksum:
+            return 'unchanged'
+        if index + 1 < len(versions) and versions[index + 1]['checksum'] == checksum:
+            # The next known version was already current at the timestamp
+            versions[index + 1]['lastUpdated'] = timestamp
+        elif index == len(versions) - 1:
+            # The current content came back after the snapshot, at the latest by the last tracked change
+            current = versions[index]['checksum']
+            versions.append({'checksum': checksum, 'lastUpdated': timestamp})
+            versions.append({'checksum': current, 'lastUpdated': known_until})
+        else:
+            versions.insert(index + 1, {'checksum': checksum, 'lastUpdated': timestamp})
+
+        entry['previous_checksums'] = versions[:-1]
+        entry['lastUpdated'] = versions[-1]['lastUpdated']
+        return 'backfilled'
+
+    def record_snapshots(self, snapshots: List[Tuple[str, List[Dict]]]) -> Dict[str, int]:
+        """Replay dated snapshots of parsed articles in chronological order.
+
+        Snapshots older than a law's tracked history fill in past versions only.
+        Articles the history does not track yet get their timeline from the
+        snapshots, unless the latest snapshot of their law no longer has them.
+        """
+        counts = {'new': 0, 'modified': 0, 'unchanged': 0, 'backfilled': 0, 'skipped': 0}
+        snapshots = sorted(snapshots, key=lambda snapshot: snapshot[0])
+        tracked_keys = set(self.history)
+        known_until = {}
+        for entry in self.history.values():
+            code = entry.get('code')
+            if code:
+                known_until[code] = max(known_until.get(code, ''), entry.get('lastUpdated', ''))
+
+        # Keys in the most recent snapshot of each law, the closest view of its current corpus
+        latest_keys = {}
+        for _, articles in snapshots:
+            snapshot_keys = {}
+            for article in articles:
+                snapshot_keys.setdefault(article['code'], set()).add(
+                    self.get_article_key(article['code'], article['article']))
+            latest_keys.update(snapshot_keys)
+        
+        for timestamp, articles in snapshots:
+            for article in articles:
+                key = self.get_article_key(article['code'], article['article'])
+                past = timestamp < known_until.get(article['code'], '')
+                if past and key in tracked_keys:
+                    status = self._record_past_version(
+                        key, self.generate_checksum(article['content']), timestamp,
+                        known_until[article['code']]
+                    )
+                    counts[status] += 1
+                    continue
+                if past and key not in latest_keys[article['code']]:
+                    counts['skipped'] += 1
+                    continue
+                
+                result = self.track_article(
+                    code=article['code'],
+                    article=article['article'],
+                    content=article['content'],
+                    title=article.get('title', ''),
+                    source_url=article.get('sourceUrl', ''),
+                    timestamp=timestamp
+                )
+                counts['backfilled' if past else result['status']] += 1
+        
+        self._save_history()
+        
+        return counts
+    
     def get_article_history(self, code: str, article: str) -> Optional[Dict]:
         """Get history for a specific article."""
         key = self.get_article_key(code, article)
         return self.history.get(key)
     
-    def generate_change_report(self, changes: Dict[str, List[Dict]]) -> str:
-        """Generate a human-readable change report."""
+    def generate_change_report(self, changes: Dict[str, List[Dict]],
+                               impact_index: Optional[Dict] = None) -> str:
+        """Generate a human-readable change report, listing impacted questions if an index is given."""
         report = []
-        report.append(f"Content Change Report - {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        # Date the report by the latest tracked change so unchanged runs produce identical output
+        last_updated = max((entry.get('lastUpdated', '') for entry in self.history.values()), default='')
+        if last_updated:
+            report.append(f"Content Change Report - {last_updated[:19].replace('T', ' ')}")
+        else:
+            report.append("Content Change Report")
         report.append("=" * 60)
         
-        if changes['new']:
-            report.append(f"\nNew Articles ({len(changes['new'])}):")
-            for article in changes['new']:
-                report.append(f"  - {article['code']} {article['article']}: {article['title']}")
+        all_impacted = []
         
-        if changes['modified']:
-            report.append(f"\nModified Articles ({len(changes['modified'])}):")
-            for article in changes['modified']:
+        for status, heading in (('new', 'New'), ('modified', 'Modified'), ('removed', 'Removed')):
+            if not changes[status]:
+                continue
+            report.append(f"\n{heading} Articles ({len(changes[status])}):")
+            for article in changes[status]:
                 report.append(f"  - {article['code']} {article['article']}: {article['title']}")
+                if impact_index:
+                    question_ids = impacted_questions(impact_index, f"{article['code']} {article['article']}")
+                    if question_ids:
+                        report.append(f"      Impacted questions: {', '.join(question_ids)}")
+                        all_impacted.extend(q for q in question_ids if q not in all_impacted)
         
-        if changes['removed']:
-            report.append(f"\nRemoved Articles ({len(changes['removed'])}):")
-            for article in changes['removed']:
-                report.append(f"  - {article['code']} {article['article']}: {article['title']}")
+        if all_impacted:
+            report.append(f"\nImpacted Questions ({len(all_impacted)}): {', '.join(all_impacted)}")
+            report.append(f"Impacted Phases: {', '.join(impacted_phases(impact_index, all_impacted))}")
         
         report.append(f"\nUnchanged Articles: {len(changes['unchanged'])}")
         report.append(f"Total Articles Tracked: {len(self.history)}")
         
-        return '\n'.join(report)
\ No newline at end of file
+        return '\n'.join(report)
@@ -0,0 +1,85 @@
+#!/usr/bin/env python3
+"""
+Delta builder for legal references - emits versioned patches between generations of the parsed output.
+"""
+
+import hashlib
+import json
+import os
+from typing import Dict, Optional
+
+from atomic_io import canonical_json, write_json_if_changed, write_text_if_changed
+
+
+def corpus_version(corpus: Dict[str, Dict]) -> str:
+    """Derive a version id from every article field, so any change a delta can carry bumps it."""
+    digest = hashlib.sha256()
+    for key in sorted(corpus):
+        article = json.dumps(corpus[key], ensure_ascii=False, sort_keys=True)
+        digest.update(f"{key}:{article}\n".encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+def build_delta(previous: Dict[str, Dict], current: Dict[str, Dict]) -> Dict:
+    """List the added, modified and removed references between two generations."""
+    added = {}
+    modified = {}
+
+    for key in sorted(current):
+        article = current[key]
+        old_article = previous.get(key)
+        if old_article is None:
+            added[key] = article
+        elif old_article != article:
+            modified[key] = article
+
+    removed = sorted(key for key in previous if key not in current)
+
+    return {
+        'manifest': {
+            'baseVersion': corpus_version(previous),
+            'targetVersion': corpus_version(current),
+            'added': len(added),
+            'modified': len(modified),
+            'removed': len(removed)
+        },
+        'added': added,
+        'modified': modified,
+        'removed': removed
+    }
+
+
+def write_delta(previous: Dict[str, Dict], current: Dict[str, Dict],
+                delta_dir: str = '../src/data/generated/deltas') -> Optional[str]:
+    """Write the delta package and update the delta manifest.
+
+    Returns the path of the written package, or None when nothing changed.
+    """
+    delta = build_delta(previous, current)
+    manifest = delta['manifest']
+    if manifest['baseVersion'] == manifest['targetVersion']:
+        return None
+
+    file_name = f"{manifest['baseVersion']}-{manifest['targetVersion']}.json"
+    delta_path = os.path.join(delta_dir, file_name)
+    write_text_if_changed(delta_path, canonical_json(delta))
+
+    manifest_path = os.path.join(delta_dir, 'manifest.json')
+    deltas_manifest = {'latestVersion': None, 'deltas': []}
+    if os.path.exists(manifest_path):
+        try:
+            with open(manifest_path, 'r', encoding='utf-8') as f:
+                deltas_manifest = json.load(f)
+        except (OSError, ValueError):
+            pass
+
+    entries = [entry for entry in deltas_manifest.get('deltas', [])
+               if entry.get('file') != file_name]
+    entries.append(dict(manifest, file=file_name,
+                        size=os.path.getsize(delta_path)))
+    write_json_if_changed(manifest_path, {
+        'latestVersion': manifest['targetVersion'],
+        'deltas': entries
+    })
+
+    return delta_path
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+HTML archive - content-addressed, gzip-compressed storage for scraped law documents.
+"""
+
+import gzip
+import hashlib
+import json
+import os
+from typing import Dict, IO, List, Optional
+
+from atomic_io import write_json_if_changed
+
+
+class HtmlArchive:
+    def __init__(self, root: str = "../src/data/laws_archive"):
+        self.root = root
+        self.objects_dir = os.path.join(root, "objects")
+        self.index_file = os.path.join(root, "index.json")
+        self.index = self._load_index()
+
+    def _load_index(self) -> Dict[str, List[Dict]]:
+        """Load the per-law version index from file."""
+        if os.path.exists(self.index_file):
+            try:
+                with open(self.index_file, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except (OSError, ValueError):
+                return {}
+        return {}
+
+    def _object_path(self, digest: str) -> str:
+        return os.path.join(self.objects_dir, digest[:2], f"{digest}.html.gz")
+
+    def put(self, law_code: str, html: str, fetched_at: str) -> str:
+        """Store a fetched document and return its digest.
+
+        Identical content is stored once; a new index entry is only added when
+        the document differs from the latest version of the law.
+        """
+        data = html.encode('utf-8')
+        digest = hashlib.sha256(data).hexdigest()
+        object_path = self._object_path(digest)
+
+        if not os.path.exists(object_path):
+            os.makedirs(os.path.dirname(object_path), exist_ok=True)
+            tmp_path = object_path + '.tmp'
+            # mtime=0 keeps the compressed bytes identical for identical content
+            with gzip.GzipFile(tmp_path, 'wb', mtime=0) as f:
+                f.write(data)
+            os.replace(tmp_path, object_path)
+
+        versions = self.index.setdefault(law_code, [])
+        if not versions or versions[-1]['digest'] != digest:
+            versions.append({
+                'digest': digest,
+                'fetchedAt': fetched_at,
+                'size': len(data)
+            })
+            write_json_if_changed(self.index_file, self.index)
+
+        return digest
+
+    def laws(self) -> List[str]:
+        """List archived law codes."""
+        return sorted(self.index)
+
+    def versions(self, law_code: str) -> List[Dict]:
+        """Get the archived versions of a law, oldest first."""
+        return self.index.get(law_code, [])
+
+    def latest(self, law_code: str) -> Optional[str]:
+        """Get the digest of the most recent version of a law."""
+        versions = self.versions(law_code)
+        return versions[-1]['digest'] if versions else None
+
+    def open(self, digest: str) -> IO[str]:
+        """Open an archived document as a text stream, decompressing on the fly."""
+        return gzip.open(self._object_path(digest), 'rt', encoding='utf-8')
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Change-impact index - maps law articles to the checklist questions and phases that cite them.
+"""
+
+import hashlib
+import json
+import os
+import re
+from typing import Dict, List
+
+from atomic_io import write_json_if_changed
+
+# Mirrors the keyword pattern used by processText() in the app
+REFERENCE_PATTERN = re.compile(
+    r'(TCK|PVSK|CMK|6136(?:\s*SK)?|2863(?:\s*SK)?|6713(?:\s*SK)?)'
+    r'(?:\s*(?:(?:EK\s+)?(?:m\.?|madde)|(?:SK\s*(?:m\.?|madde)?)|EK)?\s*)'
+    r'(\d+(?:[/.]\d+)*)',
+    re.IGNORECASE
+)
+
+
+def normalize_reference(keyword: str, article_part: str, additional: bool = False) -> str:
+    """Normalize a matched reference to a parsed output key, e.g. "6136 sk", "12" -> "6136SK 12"."""
+    code = re.sub(r'\s+', '', keyword.upper())
+    if code.isdigit():
+        code += 'SK'
+    article = article_part.replace('.', '/')
+    if additional:
+        article = f"EK {article}"
+    return f"{code} {article}"
+
+
+def extract_references(text: str) -> List[str]:
+    """Find the law references cited in a piece of text, in order of appearance."""
+    references = []
+    for match in REFERENCE_PATTERN.finditer(text):
+        # "PVSK EK m. 6" refers to additional article "EK 6"
+        filler = text[match.end(1):match.start(2)]
+        additional = re.search(r'\bEK\b', filler, re.IGNORECASE) is not None
+        key = normalize_reference(match.group(1), match.group(2), additional)
+        if key not in references:
+            references.append(key)
+    return references
+
+
+def build_impact_index(checklist: List[Dict]) -> Dict:
+    """Build the bidirectional index between law keys, question ids and phases."""
+    articles = {}
+    questions = {}
+    phases = {}
+
+    for phase in checklist:
+        phase_references = phases.setdefault(phase['id'], [])
+        for sub_category in phase.get('subCategories', []):
+            for item in sub_category.get('items', []):
+                references = extract_references(item.get('question', ''))
+                if not references:
+                    continue
+                questions[item['id']] = {
+                    'phase': phase['id'],
+                    'references': references
+                }
+                for key in references:
+                    articles.setdefault(key, []).append(item['id'])
+                    if key not in phase_references:
+                        phase_references.append(key)
+
+    return {
+        'articles': articles,
+        'questions': questions,
+        'phases': phases
+    }
+
+
+def load_impact_index(checklist_file: str = '../src/data/checklist.json',
+                      index_file: str = '../src/data/generated/impact_index.json') -> Dict:
+    """Load the impact index, rebuilding it only when the checklist has changed."""
+    with open(checklist_file, 'rb') as f:
+        checklist_bytes = f.read()
+    checklist_checksum = hashlib.sha256(checklist_bytes).hexdigest()
+
+    if os.path.exists(index_file):
+        try:
+            with open(index_file, 'r', encoding='utf-8') as f:
+                index = json.load(f)
+            if index.get('checklistChecksum') == checklist_checksum:
+                return index
+        except (OSError, ValueError):
+            pass
+
+    index = build_impact_index(json.loads(checklist_bytes.decode('utf-8')))
+    index['checklistChecksum'] = checklist_checksum
+    write_json_if_changed(index_file, index)
+    return index
+
+
+def impacted_questions(index: Dict, key: str) -> List[str]:
+    """Get the questions citing an article, including those citing its main article."""
+    question_ids = list(index['articles'].get(key, []))
+    main_key = key.split('/', 1)[0]
+    if main_key != key:
+        question_ids.extend(question_id for question_id in index['articles'].get(main_key, [])
+                            if question_id not in question_ids)
+    return question_ids
+
+
+def impacted_phases(index: Dict, question_ids: List[str]) -> List[str]:
+    """Get the phases containing the given questions."""
+    phases = []
+    for question_id in question_ids:
+        phase = index['questions'].get(question_id, {}).get('phase')
+        if phase and phase not in phases:
+            phases.append(phase)
+    return phases
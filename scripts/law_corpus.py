@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Law corpus - lazily parsed, LRU-cached query API over the scraped law HTML files.
+"""
+
+import argparse
+import json
+import os
+import re
+from collections import OrderedDict
+from typing import Dict, List, Optional
+
+from law_parser import extract_article, parse_law_articles
+
+
+class LawCorpus:
+    def __init__(self, input_dir: str = '../src/data/laws_content',
+                 generated_file: str = '../src/data/generated/html_content_parsed.json',
+                 max_laws: Optional[int] = None):
+        self.input_dir = input_dir
+        self.generated_file = generated_file
+        # At most max_laws parsed laws stay in memory; by default every available law,
+        # so lookups cycling through all laws never parse the same law twice
+        self.max_laws = max_laws
+        self._cache = OrderedDict()
+        self._generated = None
+
+    def _load_generated(self) -> Dict:
+        """Load the generated output once, grouped by law code."""
+        if self._generated is None:
+            self._generated = {}
+            if self.generated_file and os.path.exists(self.generated_file):
+                try:
+                    with open(self.generated_file, 'r', encoding='utf-8') as f:
+                        references = json.load(f)
+                except (OSError, ValueError):
+                    references = {}
+                for ref in references.values():
+                    self._generated.setdefault(ref['code'], {})[ref['article']] = ref
+        return self._generated
+
+    def _html_path(self, code: str) -> str:
+        return os.path.join(self.input_dir, f"{code}.html")
+
+    def laws(self) -> List[str]:
+        """List law codes available from HTML files or the generated output."""
+        codes = set(self._load_generated())
+        if os.path.isdir(self.input_dir):
+            codes.update(filename[:-len('.html')]
+                         for filename in os.listdir(self.input_dir)
+                         if filename.endswith('.html'))
+        return sorted(codes)
+
+    def _build_index(self, code: str) -> Optional[Dict]:
+        """Parse a law once and index every main article and sub-article."""
+        articles = {}
+        order = []
+        titles = {}
+
+        html_path = self._html_path(code)
+        if os.path.exists(html_path):
+            law_code, main_articles_parsed = parse_law_articles(html_path)
+            for main_num, main_article in main_articles_parsed.items():
+                order.append(main_num)
+                titles[main_num] = main_article['title']
+                article = extract_article(main_articles_parsed, law_code, main_num)
+                if article:
+                    articles[main_num] = article
+                for sub_num in main_article['sub_articles']:
+                    article_id = f"{main_num}/{sub_num}"
+                    article = extract_article(main_articles_parsed, law_code, article_id)
+                    if article:
+                        articles[article_id] = article
+
+        # Generated entries carry tracking metadata and special-case extractions
+        generated = self._load_generated().get(code, {})
+        for article_id, ref in generated.items():
+            articles[article_id] = ref
+            main_num = article_id.split('/', 1)[0]
+            if main_num not in titles:
+                order.append(main_num)
+                titles[main_num] = ref.get('title', '')
+
+        if not articles and not order:
+            return None
+
+        if not os.path.exists(html_path):
+            order.sort(key=article_sort_key)
+
+        return {
+            'articles': articles,
+            'order': order,
+            'position': {main_num: i for i, main_num in enumerate(order)},
+            'titles': titles
+        }
+
+    def _law_index(self, code: str) -> Optional[Dict]:
+        """Return the index for a law, parsing it on first access."""
+        if code in self._cache:
+            self._cache.move_to_end(code)
+            return self._cache[code]
+
+        index = self._build_index(code)
+        if index is None:
+            return None
+
+        self._cache[code] = index
+        if len(self._cache) > (self.max_laws or len(self.laws())):
+            self._cache.popitem(last=False)
+        return index
+
+    def get(self, reference: str) -> Optional[Dict]:
+        """Look up a reference such as "CMK 134/2"."""
+        parts = reference.strip().split(' ', 1)
+        if len(parts) != 2:
+            return None
+        index = self._law_index(parts[0])
+        if index is None:
+            return None
+        return index['articles'].get(parts[1].strip())
+
+    def titles(self, code: str) -> Dict[str, str]:
+        """Get article titles of a law in document order."""
+        index = self._law_index(code)
+        if index is None:
+            return {}
+        return {main_num: index['titles'][main_num] for main_num in index['order']}
+
+    def range(self, code: str, start: str, end: str) -> List[Dict]:
+        """Get main articles from start to end (inclusive) in document order."""
+        index = self._law_index(code)
+        if index is None:
+            return []
+        position = index['position']
+        if start not in position or end not in position:
+            return []
+        articles = index['articles']
+        return [articles[main_num]
+                for main_num in index['order'][position[start]:position[end] + 1]
+                if main_num in articles]
+
+
+def article_sort_key(article_id: str):
+    """Sort key ordering article ids naturally ("9" < "10" < "EK 1")."""
+    return [(0, int(part), '') if part.isdigit() else (1, 0, part)
+            for part in re.split(r'(\d+)', article_id) if part]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Query law articles from the parsed corpus')
+    parser.add_argument('references', nargs='+',
+                        help='References to look up, e.g. "CMK 134/2"')
+    parser.add_argument('--input-dir', default='../src/data/laws_content',
+                        help='Directory containing HTML files')
+    parser.add_argument('--generated-file', default='../src/data/generated/html_content_parsed.json',
+                        help='Generated JSON file')
+    args = parser.parse_args()
+
+    corpus = LawCorpus(input_dir=args.input_dir, generated_file=args.generated_file)
+    for reference in args.references:
+        article = corpus.get(reference)
+        if article:
+            print(f"{reference}: {article['title']}\n{article['content']}\n")
+        else:
+            print(f"{reference}: not found\n")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,4 +1,5 @@
 #!/usr/bin/env python3
+import io
 import os
 import re
 import json
@@ -7,6 +8,12 @@ import argparse
 from datetime import datetime
 from content_tracker import ContentTracker
 from metadata_manager import MetadataManager
+from atomic_io import write_json_if_changed, write_text_if_changed
+from html_archive import HtmlArchive
+from delta_builder import write_delta
+from impact_index import load_impact_index
+from reference_graph import build_reference_graph, expand_targets
+from amendment_notes import build_amendment_index, parse_amendment_notes, strip_amendment_notes
 
 # Define the target articles list
 TARGET_ARTICLES = [
@@ -70,13 +77,20 @@ def normalize_article_num(article_num_str):
     return article_num_str.strip()
 
 
-def parse_html_file(file_path):
-    """Parse the HTML file and extract article information using a two-pass approach."""
-    with open(file_path, 'r', encoding='utf-8') as file:
-        html_content = file.read()
+def parse_law_articles(file_path, law_code=None):
+    """Parse the HTML file and collect title, content and sub-articles of every main article.
+
+    file_path may also be an open text stream (e.g. from HtmlArchive.open()),
+    in which case law_code must be given.
+    """
+    if hasattr(file_path, 'read'):
+        html_content = file_path.read()
+    else:
+        with open(file_path, 'r', encoding='utf-8') as file:
+            html_content = file.read()
+        law_code = law_code or extract_law_code(file_path)
 
     soup = BeautifulSoup(html_content, 'html.parser')
-    law_code = extract_law_code(file_path)
 
     paragraphs = soup.find_all('p')
 
@@ -102,6 +116,8 @@ def parse_html_file(file_path):
     main_articles_parsed = {}
     current_main_article_num = None
     current_sub_article_num = None
+    # Standalone modification notes precede the article (or heading) they amend
+    pending_notes = []
 
     # Pass 1: Collect content for all main articles, and their associated titles
     for i, p_tag in enumerate(paragraphs):
@@ -111,8 +127,9 @@ def parse_html_file(file_path):
         if not cleaned_text:
             continue
 
-        # Skip modification notes early
+        # Keep standalone modification notes out of content, but remember them
         if modification_note_pattern.match(cleaned_text):
+            pending_notes.extend(parse_amendment_notes(cleaned_text))
             continue
 
         main_article_match = main_article_pattern.match(cleaned_text)
@@ -151,8 +168,10 @@ def parse_html_file(file_path):
             main_articles_parsed[current_main_article_num] = {
                 'title': current_main_article_title,
                 'content_paragraphs': [],
-                'sub_articles': {}
+                'sub_articles': {},
+                'notes': pending_notes
             }
+            pending_notes = []
 
             # Special handling for content after article declaration
             if content_after_declaration:
@@ -210,10 +229,71 @@ def parse_html_file(file_path):
                 main_articles_parsed[current_main_article_num]['sub_articles']['1'].append(
                     cleaned_text)
 
-    # Pass 2: Extract specific target articles
+    return law_code, main_articles_parsed
+
+
+def extract_article(main_articles_parsed, law_code, article_id):
+    """Resolve an article id such as "134" or "134/2" against parsed main articles."""
+    # Handle main articles without sub-parts
+    if '/' not in article_id and article_id in main_articles_parsed:
+        article_data = main_articles_parsed[article_id]
+        full_content = "\n".join(
+            [line for line in article_data['content_paragraphs'] if line.strip()]).strip()
+
+        return {
+            'code': law_code,
+            'article': article_id,
+            'title': article_data['title'],
+            'content': full_content
+        }
+
+    # Handle sub-articles
+    parts = article_id.split('/')
+    if len(parts) != 2:
+        return None
+
+    main_num = parts[0]
+    sub_num_target = parts[1]
+
+    if main_num not in main_articles_parsed:
+        return None
+
+    main_article_data = main_articles_parsed[main_num]
+
+    # First try to get content from structured sub_articles
+    if sub_num_target in main_article_data['sub_articles']:
+        sub_content = "\n".join(
+            filter(None, main_article_data['sub_articles'][sub_num_target])).strip()
+        if sub_content:
+            return {
+                'code': law_code,
+                'article': article_id,
+                'title': main_article_data['title'],
+                'content': sub_content
+            }
+
+    # If not found in structured sub_articles, try to extract from main content
+    content_lines = main_article_data['content_paragraphs']
+    if content_lines:
+        # For sub-article 1, if it's not explicitly marked, use the first paragraph
+        if sub_num_target == '1' and not any(line.strip().startswith('(1)') for line in content_lines):
+            first_content = content_lines[0].strip()
+            if first_content:
+                return {
+                    'code': law_code,
+                    'article': article_id,
+                    'title': main_article_data['title'],
+                    'content': first_content
+                }
+
+    return None
+
+
+def extract_target_articles(main_articles_parsed, law_code, targets):
+    """Extract the target articles of one law, with their amendment notes."""
     final_results = []
 
-    for target_article_key in TARGET_ARTICLES_SET:
+    for target_article_key in sorted(targets):
         target_parts = target_article_key.split(' ', 1)
         if len(target_parts) != 2:
             continue
@@ -223,93 +303,95 @@ def parse_html_file(file_path):
         if target_law_code != law_code:
             continue
 
-        # Handle main articles without sub-parts
-        if '/' not in target_article_id and target_article_id in main_articles_parsed:
-            article_data = main_articles_parsed[target_article_id]
-            full_content = "\n".join(
-                [line for line in article_data['content_paragraphs'] if line.strip()]).strip()
+        article = extract_article(
+            main_articles_parsed, law_code, target_article_id)
+        if article:
+            main_num = target_article_id.split('/', 1)[0]
+            article['amendments'] = (main_articles_parsed[main_num]['notes'] +
+                                     parse_amendment_notes(article['content']))
+            final_results.append(article)
 
-            final_results.append({
-                'code': law_code,
-                'article': target_article_id,
-                'title': article_data['title'],
-                'content': full_content
-            })
-            continue
+    return final_results
 
-        # Handle sub-articles
-        parts = target_article_id.split('/')
-        if len(parts) == 2:
-            main_num = parts[0]
-            sub_num_target = parts[1]
-
-            if main_num in main_articles_parsed:
-                main_article_data = main_articles_parsed[main_num]
-
-                # First try to get content from structured sub_articles
-                if sub_num_target in main_article_data['sub_articles']:
-                    sub_content = "\n".join(
-                        filter(None, main_article_data['sub_articles'][sub_num_target])).strip()
-                    if sub_content:
-                        final_results.append({
-                            'code': law_code,
-                            'article': target_article_id,
-                            'title': main_article_data['title'],
-                            'content': sub_content
-                        })
-                        continue
-
-                # If not found in structured sub_articles, try to extract from main content
-                content_lines = main_article_data['content_paragraphs']
-                if content_lines:
-                    # For sub-article 1, if it's not explicitly marked, use the first paragraph
-                    if sub_num_target == '1' and not any(line.strip().startswith('(1)') for line in content_lines):
-                        first_content = content_lines[0].strip()
-                        if first_content:
-                            final_results.append({
-                                'code': law_code,
-                                'article': target_article_id,
-                                'title': main_article_data['title'],
-                                'content': first_content
-                            })
 
-    return final_results
+def parse_html_file(file_path, law_code=None):
+    """Parse the HTML file and extract article information using a two-pass approach."""
+    # Pass 1: Collect content for all main articles, and their associated titles
+    law_code, main_articles_parsed = parse_law_articles(file_path, law_code)
 
+    # Pass 2: Extract specific target articles
+    return extract_target_articles(main_articles_parsed, law_code, TARGET_ARTICLES_SET)
+
+
+def iter_law_sources(directory, archive_root=None):
+    """Yield (law_code, source, label) for each law, from the archive if given, else from HTML files."""
+    if archive_root:
+        archive = HtmlArchive(archive_root)
+        # A missing or mistyped archive root would otherwise look like an empty archive
+        if not os.path.exists(archive.index_file):
+            raise FileNotFoundError(f"No archive index found at {archive.index_file}")
+        if not archive.laws():
+            raise ValueError(f"Archive {archive_root} contains no laws")
+        for law_code in archive.laws():
+            digest = archive.latest(law_code)
+            with archive.open(digest) as stream:
+                yield law_code, stream, f"{law_code} (archived {digest[:12]})"
+        return
+
+    for filename in sorted(os.listdir(directory)):
+        if filename.endswith('.html'):
+            file_path = os.path.join(directory, filename)
+            yield extract_law_code(file_path), file_path, file_path
 
-def process_all_files(directory, output_file):
+
+def process_all_files(directory, output_file, archive_root=None, strip_notes=False,
+                      follow_references=0, checklist_file='../src/data/checklist.json'):
     """Process all HTML files in the directory and generate a single JSON file."""
     result = {}
+    amendments_by_article = {}
+    # History, report and indexes live next to the output file
+    generated_dir = os.path.dirname(output_file) or '.'
     
     # Initialize content tracker and metadata manager
-    tracker = ContentTracker(history_file='../src/data/generated/law_content_history.json')
+    tracker = ContentTracker(history_file=os.path.join(generated_dir, 'law_content_history.json'))
     metadata_manager = MetadataManager()
 
-    for filename in os.listdir(directory):
-        if filename.endswith('.html'):
-            file_path = os.path.join(directory, filename)
-            print(f"Processing {file_path}...")
-
-            articles = parse_html_file(file_path)
-
-            # Add to the result dictionary with metadata enhancement
-            for article in articles:
-                key = f"{article['code']} {article['article']}"
-                
-                # Track content and add metadata
-                tracking_result = tracker.track_article(
-                    code=article['code'],
-                    article=article['article'],
-                    content=article['content'],
-                    title=article.get('title', ''),
-                    source_url=f"https://www.mevzuat.gov.tr/mevzuat?MevzuatNo={article['code']}"
-                )
-                
-                # Add metadata to article
-                article['lastUpdated'] = tracking_result['lastUpdated']
-                article['checksum'] = tracking_result['checksum']
-                article['sourceUrl'] = f"https://www.mevzuat.gov.tr/mevzuat?MevzuatNo={article['code']}"
-                
-                result[key] = article
+    # Pass 1 for every law, kept so referenced articles can be pulled in. The HTML is kept
+    # too, so the special extraction below reads the same source as the main parse
+    parsed_laws = {}
+    html_by_law = {}
+    for law_code, source, label in iter_law_sources(directory, archive_root):
+        print(f"Processing {label}...")
+        if hasattr(source, 'read'):
+            html_content = source.read()
+        else:
+            with open(source, 'r', encoding='utf-8') as file:
+                html_content = file.read()
+        html_by_law[law_code] = html_content
+        law_code, parsed_laws[law_code] = parse_law_articles(io.StringIO(html_content), law_code)
+    if not parsed_laws:
+        raise ValueError(f"No law HTML files found in {directory}")
+
+    targets = TARGET_ARTICLES_SET
+    if follow_references:
+        def lookup(key):
+            law_code, _, article_id = key.partition(' ')
+            if law_code not in parsed_laws:
+                return None
+            return extract_article(parsed_laws[law_code], law_code, article_id)
+
+        targets = set(expand_targets(sorted(TARGET_ARTICLES_SET), lookup, follow_references))
+        print(f"Following references added {len(targets) - len(TARGET_ARTICLES_SET)} articles")
+
+    for law_code, main_articles_parsed in parsed_laws.items():
+        articles = extract_target_articles(main_articles_parsed, law_code, targets)
+
+        # Add to the result dictionary, metadata is added once all articles are tracked
+        for article in articles:
+            key = f"{article['code']} {article['article']}"
+            amendments_by_article[key] = article.pop('amendments', [])
+            article['sourceUrl'] = f"https://www.mevzuat.gov.tr/mevzuat?MevzuatNo={article['code']}"
+            result[key] = article
 
     # Special handling for any missing articles, particularly CMK with "/1" sub-articles
     missing_articles = []
@@ -321,15 +403,11 @@ def process_all_files(directory, output_file):
             # For CMK articles with sub-article 1
             if law_code == "CMK" and target.endswith("/1"):
                 main_article_num = target.split(' ')[1].split('/')[0]
-                html_file = os.path.join(directory, f"{law_code}.html")
 
-                if os.path.exists(html_file):
+                if law_code in html_by_law:
                     print(f"Special extraction for {target}...")
 
-                    with open(html_file, 'r', encoding='utf-8') as file:
-                        html_content = file.read()
-
-                    soup = BeautifulSoup(html_content, 'html.parser')
+                    soup = BeautifulSoup(html_by_law[law_code], 'html.parser')
                     paragraphs = soup.find_all('p')
 
                     # Pattern to find the article declaration
@@ -379,39 +457,67 @@ def process_all_files(directory, output_file):
 
                                 idx += 1
 
-                            # Add to results with metadata
+                            # Add to results
                             article_id = target.split(' ')[1]
                             article_data = {
                                 'code': law_code,
                                 'article': article_id,
                                 'title': article_title,
-                                'content': sub_content
+                                'content': sub_content,
+                                'sourceUrl': f"https://www.mevzuat.gov.tr/mevzuat?MevzuatNo={law_code}"
                             }
                             
-                            # Track content and add metadata
-                            tracking_result = tracker.track_article(
-                                code=law_code,
-                                article=article_id,
-                                content=sub_content,
-                                title=article_title,
-                                source_url=f"https://www.mevzuat.gov.tr/mevzuat?MevzuatNo={law_code}"
-                            )
-                            
-                            article_data['lastUpdated'] = tracking_result['lastUpdated']
-                            article_data['checksum'] = tracking_result['checksum']
-                            article_data['sourceUrl'] = f"https://www.mevzuat.gov.tr/mevzuat?MevzuatNo={law_code}"
-                            
                             result[target] = article_data
+                            amendments_by_article[target] = parse_amendment_notes(sub_content)
                             print(f"  Successfully extracted {target}")
 
+    # An empty result would publish a delta removing every reference, so emit nothing
+    if not result:
+        raise ValueError(f"No target articles parsed, leaving {output_file} untouched")
+
+    # Canonical order, independent of directory listing and target iteration
+    result = {key: result[key] for key in sorted(result)}
+
+    # Load the checklist index before anything is written, so a bad path leaves no partial output
+    impact_index = load_impact_index(checklist_file, os.path.join(generated_dir, 'impact_index.json'))
+
+    # Track every article once, so the change report sees new and modified articles
+    changes = tracker.detect_changes(list(result.values()))
+    for article in result.values():
+        history = tracker.get_article_history(article['code'], article['article'])
+        article['lastUpdated'] = history['lastUpdated']
+        article['checksum'] = history['checksum']
+        article['sourceUrl'] = article.pop('sourceUrl')
+        # Notes are already captured in the amendment index. Strip them only from the
+        # emitted text, so toggling this never changes the tracked checksums
+        if strip_notes:
+            article['content'] = strip_amendment_notes(article['content'])
+
+    # Keep the previous generation to build the delta package against
+    previous_result = {}
+    if os.path.exists(output_file):
+        try:
+            with open(output_file, 'r', encoding='utf-8') as f:
+                previous_result = json.load(f)
+        except (OSError, ValueError):
+            previous_result = {}
+
     # Write the result to a single JSON file
-    with open(output_file, 'w', encoding='utf-8') as f:
-        json.dump(result, f, ensure_ascii=False, indent=2)
+    output_written = write_json_if_changed(output_file, result)
+
+    # Write the delta package next to the full output
+    delta_file = write_delta(previous_result, result, os.path.join(generated_dir, 'deltas'))
+
+    # Write the cross-reference graph so referenced articles can be prefetched
+    reference_graph_file = os.path.join(generated_dir, 'reference_graph.json')
+    write_json_if_changed(reference_graph_file, build_reference_graph(result))
+
+    # Write the amendment note index, keyed by article and by amending law
+    amendment_index_file = os.path.join(generated_dir, 'amendment_index.json')
+    write_json_if_changed(amendment_index_file, build_amendment_index(amendments_by_article))
 
-    # Generate change detection report
-    all_articles = list(result.values())
-    changes = tracker.detect_changes(all_articles)
-    change_report = tracker.generate_change_report(changes)
+    # Generate change detection report with the checklist questions each change impacts
+    change_report = tracker.generate_change_report(changes, impact_index)
     
     # Print summary
     print("\n" + "="*60)
@@ -419,14 +525,23 @@ def process_all_files(directory, output_file):
     if missing_articles:
         print(
             f"Missing {len(missing_articles)} articles: {', '.join(missing_articles)}")
-    print(f"Saved to {output_file}")
+    if output_written:
+        print(f"Saved to {output_file}")
+    else:
+        print(f"No changes, {output_file} left untouched")
+    if delta_file:
+        print(f"Delta package saved to {delta_file}")
+
+    # Metadata completeness of the emitted references
+    validation = metadata_manager.validate_batch(result.values())
+    print(f"Metadata: {validation['valid']}/{validation['total']} references valid, "
+          f"{validation['oldContent']} older than {validation['oldContentMonths']} months")
     
     # Print change report
     print("\n" + change_report)
     
     # Also save the change report to a file
-    with open('../src/data/generated/law_content_changes.txt', 'w', encoding='utf-8') as f:
-        f.write(change_report)
+    write_text_if_changed(os.path.join(generated_dir, 'law_content_changes.txt'), change_report)
 
     return result
 
@@ -438,10 +553,19 @@ def main():
                         help='Directory containing HTML files')
     parser.add_argument(
         '--output-file', default='../src/data/generated/html_content_parsed.json', help='Output JSON file')
+    parser.add_argument('--archive-dir', default=None,
+                        help='Parse the latest archived version of each law instead of --input-dir')
+    parser.add_argument('--strip-amendment-notes', action='store_true',
+                        help='Remove inline amendment notes from article content')
+    parser.add_argument('--follow-references', type=int, default=0, metavar='DEPTH',
+                        help='Also include articles referenced by the targets, up to DEPTH hops')
+    parser.add_argument('--checklist-file', default='../src/data/checklist.json',
+                        help='Checklist JSON used to list the questions impacted by changes')
     args = parser.parse_args()
 
     # Process all HTML files and output to a single file
-    process_all_files(args.input_dir, args.output_file)
+    process_all_files(args.input_dir, args.output_file, args.archive_dir,
+                      args.strip_amendment_notes, args.follow_references, args.checklist_file)
 
 
 if __name__ == "__main__":
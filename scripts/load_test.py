@@ -0,0 +1,263 @@
+#!/usr/bin/env python3
+"""
+Pipeline load test - runs the real scrape and parse code paths against a local mevzuat stand-in server.
+"""
+
+import argparse
+import contextlib
+import io
+import json
+import math
+import os
+import random
+import tempfile
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+from urllib.parse import parse_qs, urlparse
+
+import law_parser
+import scrape_laws
+
+LAW_CODES = ["CMK", "TCK", "PVSK", "2863SK", "6136SK", "6713SK"]
+
+
+class StandInHandler(BaseHTTPRequestHandler):
+    """Serves mevzuat-like pages: an outer page whose iframe loads the law text."""
+
+    def do_GET(self):
+        server = self.server
+        parsed = urlparse(self.path)
+
+        delay = server.latency + random.uniform(0, server.jitter)
+        if delay > 0:
+            time.sleep(delay)
+
+        # Browsers render error pages like any other, so failures have to be ones the scraper
+        # can see: an outer page without the iframe, or an iframe without law text
+        failed = random.random() < server.failure_rate
+
+        if parsed.path == '/mevzuat':
+            law_code = parse_qs(parsed.query).get('MevzuatNo', [''])[0]
+            if failed:
+                self._respond(503, "<html><body>Service Unavailable</body></html>")
+                return
+            if law_code in server.documents:
+                self._respond(200, f'<html><body><iframe src="/MevzuatMetin/{law_code}"></iframe></body></html>')
+                return
+        elif parsed.path.startswith('/MevzuatMetin/'):
+            law_code = parsed.path[len('/MevzuatMetin/'):]
+            if failed:
+                self._respond(503, "<html><body><p>Service Unavailable</p></body></html>")
+                return
+            if law_code in server.documents:
+                self._respond(200, f"<html><body>{server.documents[law_code]}</body></html>")
+                return
+
+        self._respond(404, "<html><body>Not Found</body></html>")
+
+    def _respond(self, status: int, body: str):
+        data = body.encode('utf-8')
+        self.send_response(status)
+        self.send_header('Content-Type', 'text/html; charset=utf-8')
+        self.send_header('Content-Length', str(len(data)))
+        self.end_headers()
+        self.wfile.write(data)
+
+    def log_message(self, format, *args):
+        pass
+
+
+class StandInServer(ThreadingHTTPServer):
+    daemon_threads = True
+
+    def __init__(self, documents: Dict[str, str], latency: float = 0.0,
+                 jitter: float = 0.0, failure_rate: float = 0.0, port: int = 0):
+        super().__init__(('127.0.0.1', port), StandInHandler)
+        self.documents = documents
+        self.latency = latency
+        self.jitter = jitter
+        self.failure_rate = failure_rate
+
+    def url_for(self, law_code: str) -> str:
+        return f"http://127.0.0.1:{self.server_address[1]}/mevzuat?MevzuatNo={law_code}"
+
+
+def synthetic_law_html(law_code: str, articles: int = 300, seed: int = 0) -> str:
+    """Generate law HTML shaped like mevzuat output, with sub-articles, notes and references."""
+    rng = random.Random(f"{law_code}-{seed}")
+    words = ["hâkim", "kararı", "üzerine", "Cumhuriyet", "savcısı", "şüpheli", "müdafi",
+             "kolluk", "görevlileri", "tutanak", "soruşturma", "kovuşturma", "hâlinde"]
+    paragraphs = []
+    for number in range(1, articles + 1):
+        paragraphs.append(f"<p>Hüküm {number} başlığı</p>")
+        sub_articles = rng.randint(1, 4)
+        for sub in range(1, sub_articles + 1):
+            text = ' '.join(rng.choice(words) for _ in range(rng.randint(15, 60)))
+            if rng.random() < 0.2:
+                text = f"(Değişik: {rng.randint(1, 28)}/{rng.randint(1, 12)}/20{rng.randint(5, 24):02d}-" \
+                       f"{rng.randint(5000, 7600)}/{rng.randint(1, 200)} md.) {text}"
+            if rng.random() < 0.2:
+                text += f", {rng.randint(1, articles)} inci maddenin birinci fıkrası saklıdır."
+            else:
+                text += "."
+            prefix = f"Madde {number} – " if sub == 1 else ""
+            paragraphs.append(f"<p>{prefix}({sub}) {text}</p>")
+    return '\n'.join(paragraphs)
+
+
+def load_fixtures(fixtures_dir: str) -> Dict[str, str]:
+    """Load <LAW>.html fixture files."""
+    documents = {}
+    for filename in sorted(os.listdir(fixtures_dir)):
+        if filename.endswith('.html'):
+            with open(os.path.join(fixtures_dir, filename), 'r', encoding='utf-8') as f:
+                documents[filename[:-len('.html')]] = f.read()
+    return documents
+
+
+def percentile(samples: List[float], pct: float) -> Optional[float]:
+    """Nearest-rank percentile in seconds, rounded to milliseconds."""
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    rank = max(math.ceil(pct / 100 * len(ordered)) - 1, 0)
+    return round(ordered[min(rank, len(ordered) - 1)], 3)
+
+
+def run_load_test(documents: Dict[str, str], rounds: int = 3, latency: float = 0.0,
+                  jitter: float = 0.0, failure_rate: float = 0.0,
+                  max_attempts: int = scrape_laws.MAX_ATTEMPTS, rate: float = 100.0,
+                  verbose: bool = False) -> Dict:
+    """Scrape and parse the documents through the stand-in server and measure the pipeline."""
+    server = StandInServer(documents, latency, jitter, failure_rate)
+    thread = threading.Thread(target=server.serve_forever, daemon=True)
+    thread.start()
+
+    urls = {law_code: server.url_for(law_code) for law_code in documents}
+    samples = {law_code: [] for law_code in documents}
+    attempts = {law_code: 0 for law_code in documents}
+    failures = 0
+    scrape_seconds = 0.0
+    output = contextlib.nullcontext() if verbose else contextlib.redirect_stdout(io.StringIO())
+
+    try:
+        with tempfile.TemporaryDirectory() as workdir, output:
+            content_dir = os.path.join(workdir, 'laws_content')
+            generated_dir = os.path.join(workdir, 'generated')
+            os.makedirs(content_dir)
+            os.makedirs(generated_dir)
+            metadata_file = os.path.join(content_dir, 'scraping_metadata.json')
+
+            for _ in range(rounds):
+                started = time.monotonic()
+                checkpoint = scrape_laws.run_scraping(
+                    metadata_file, fresh=True, max_attempts=max_attempts, urls=urls,
+                    output_dir=content_dir, archive_dir=os.path.join(workdir, 'archive'),
+                    rate=rate)
+                scrape_seconds += time.monotonic() - started
+
+                for law_code, entry in checkpoint['laws'].items():
+                    attempts[law_code] += entry.get('attempts', 0)
+                    if entry.get('status') == 'success':
+                        samples[law_code].append(entry['duration_seconds'])
+                    else:
+                        failures += 1
+
+            # The parser refuses to emit anything when no law was fetched
+            result, parse_seconds = {}, 0.0
+            if any(samples.values()):
+                started = time.monotonic()
+                result = law_parser.process_all_files(
+                    content_dir, os.path.join(generated_dir, 'html_content_parsed.json'))
+                parse_seconds = time.monotonic() - started
+    finally:
+        server.shutdown()
+        server.server_close()
+
+    fetched = sum(len(law_samples) for law_samples in samples.values())
+    fetched_bytes = sum(len(documents[law_code].encode('utf-8')) * len(law_samples)
+                        for law_code, law_samples in samples.items())
+    all_samples = [sample for law_samples in samples.values() for sample in law_samples]
+
+    return {
+        'rounds': rounds,
+        'laws': len(documents),
+        'scrape': {
+            'seconds': round(scrape_seconds, 3),
+            'fetched': fetched,
+            'failedLaws': failures,
+            'retries': sum(attempts.values()) - fetched - failures,
+            'lawsPerSecond': round(fetched / scrape_seconds, 3) if scrape_seconds else None,
+            'bytesPerSecond': round(fetched_bytes / scrape_seconds) if scrape_seconds else None,
+            'p50': percentile(all_samples, 50),
+            'p95': percentile(all_samples, 95),
+            'p99': percentile(all_samples, 99)
+        },
+        'perLaw': {
+            law_code: {
+                'p50': percentile(law_samples, 50),
+                'p95': percentile(law_samples, 95),
+                'max': round(max(law_samples), 3) if law_samples else None,
+                'attempts': attempts[law_code]
+            }
+            for law_code, law_samples in samples.items()
+        },
+        'parse': {
+            'seconds': round(parse_seconds, 3),
+            'articles': len(result),
+            'articlesPerSecond': round(len(result) / parse_seconds, 1) if parse_seconds else None
+        },
+        'totalRefreshSeconds': round(scrape_seconds / max(rounds, 1) + parse_seconds, 3)
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Load test the scrape -> parse -> track -> emit pipeline against a local stand-in server')
+    parser.add_argument('--fixtures-dir', default=None,
+                        help='Directory with <LAW>.html fixtures (default: synthetic HTML)')
+    parser.add_argument('--articles', type=int, default=300,
+                        help='Articles per synthetic law')
+    parser.add_argument('--rounds', type=int, default=3,
+                        help='Number of full scraping rounds')
+    parser.add_argument('--latency-ms', type=float, default=0.0,
+                        help='Base response latency in milliseconds')
+    parser.add_argument('--jitter-ms', type=float, default=0.0,
+                        help='Additional random latency in milliseconds')
+    parser.add_argument('--failure-rate', type=float, default=0.0,
+                        help='Fraction of requests answered with an error page')
+    parser.add_argument('--max-attempts', type=int, default=scrape_laws.MAX_ATTEMPTS,
+                        help='Maximum attempts per law')
+    parser.add_argument('--rate', type=float, default=100.0,
+                        help='Politeness limit in requests per second')
+    parser.add_argument('--page-timeout', type=float, default=scrape_laws.PAGE_LOAD_TIMEOUT_SECONDS,
+                        help='Seconds the scraper waits for the iframe before a failed outer page counts')
+    parser.add_argument('--chromedriver', default=scrape_laws.CHROMEDRIVER_PATH,
+                        help='Path to chromedriver')
+    parser.add_argument('--report-file', default=None,
+                        help='Also write the JSON report to this file')
+    parser.add_argument('--verbose', action='store_true',
+                        help='Show scraper and parser output')
+    args = parser.parse_args()
+
+    scrape_laws.CHROMEDRIVER_PATH = args.chromedriver
+    scrape_laws.PAGE_LOAD_TIMEOUT_SECONDS = args.page_timeout
+    if args.fixtures_dir:
+        documents = load_fixtures(args.fixtures_dir)
+    else:
+        documents = {law_code: synthetic_law_html(law_code, args.articles) for law_code in LAW_CODES}
+
+    report = run_load_test(documents, args.rounds, args.latency_ms / 1000, args.jitter_ms / 1000,
+                           args.failure_rate, args.max_attempts, args.rate, args.verbose)
+
+    report_json = json.dumps(report, ensure_ascii=False, indent=2)
+    print(report_json)
+    if args.report_file:
+        with open(args.report_file, 'w', encoding='utf-8') as f:
+            f.write(report_json)
+
+
+if __name__ == "__main__":
+    main()
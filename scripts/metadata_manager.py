@@ -3,10 +3,95 @@
 Metadata manager for legal references - handles timestamp and metadata operations.
 """
 
+import argparse
 import json
 import os
-from datetime import datetime
-from typing import Dict, List, Optional
+import sys
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Iterator, List, Optional
+
+REQUIRED_FIELDS = ['code', 'article', 'content', 'lastUpdated', 'checksum']
+OPTIONAL_FIELDS = ['title', 'sourceUrl', 'firstSeen']
+# Content history entries carry no content
+HISTORY_REQUIRED_FIELDS = ['code', 'article', 'lastUpdated', 'checksum']
+
+AGE_BUCKETS = ['<1 month', '1-5 months', '6-11 months', '12+ months', 'unparseable']
+
+
+def iter_json_records(path: str, chunk_size: int = 1 << 16) -> Iterator[Dict]:
+    """Stream the values of a top-level JSON object or array, or the lines of a .jsonl file.
+
+    Only one record at a time is held in memory, so files of any size can be validated.
+    """
+    decoder = json.JSONDecoder()
+
+    with open(path, 'r', encoding='utf-8') as f:
+        buffer = ''
+        pos = 0
+        eof = False
+
+        def more() -> bool:
+            nonlocal buffer, pos, eof
+            if eof:
+                return False
+            chunk = f.read(max(chunk_size, len(buffer) - pos))
+            if not chunk:
+                eof = True
+                return False
+            buffer = buffer[pos:] + chunk
+            pos = 0
+            return True
+
+        def next_char() -> str:
+            nonlocal pos
+            while True:
+                while pos < len(buffer) and buffer[pos].isspace():
+                    pos += 1
+                if pos < len(buffer):
+                    return buffer[pos]
+                if not more():
+                    return ''
+
+        def decode():
+            nonlocal pos
+            while True:
+                try:
+                    value, end = decoder.raw_decode(buffer, pos)
+                    # A value ending at the buffer edge may continue in the next chunk
+                    if end < len(buffer) or eof:
+                        pos = end
+                        return value
+                except json.JSONDecodeError:
+                    if eof:
+                        raise
+                more()
+
+        if path.endswith('.jsonl'):
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+            return
+
+        opening = next_char()
+        if opening not in ('{', '['):
+            raise ValueError(f"Expected a JSON object or array in {path}")
+        closing = '}' if opening == '{' else ']'
+        pos += 1
+        while True:
+            char = next_char()
+            if char == closing:
+                return
+            if char == ',':
+                pos += 1
+                next_char()
+            if opening == '{':
+                decode()
+                if next_char() != ':':
+                    raise ValueError(f"Malformed JSON object in {path}")
+                pos += 1
+                next_char()
+            yield decode()
+
 
 class MetadataManager:
     def __init__(self):
@@ -108,8 +193,8 @@ class MetadataManager:
     
     def validate_metadata(self, reference: Dict) -> Dict[str, bool]:
         """Validate that a reference has all required metadata fields."""
-        required_fields = ['code', 'article', 'content', 'lastUpdated', 'checksum']
-        optional_fields = ['title', 'sourceUrl', 'firstSeen']
+        required_fields = REQUIRED_FIELDS
+        optional_fields = OPTIONAL_FIELDS
         
         validation = {
             'valid': True,
@@ -151,46 +236,137 @@ class MetadataManager:
             month_diff = (months_ago.year - last_updated_dt.year) * 12 + months_ago.month - last_updated_dt.month
             
             return month_diff >= months
-        except:
+        except (AttributeError, ValueError):
             return False
     
-    def generate_metadata_report(self, references: List[Dict]) -> str:
-        """Generate a report on metadata completeness."""
-        report = []
-        report.append("Metadata Validation Report")
-        report.append("=" * 40)
-        
-        total = len(references)
+    def validate_batch(self, references: Iterable[Dict], months: int = 6,
+                       required_fields: List[str] = REQUIRED_FIELDS,
+                       now: Optional[datetime] = None) -> Dict:
+        """Validate many references in a single pass and summarize them.
+
+        Each distinct timestamp is parsed once; references are consumed as they
+        are iterated, so this works on streams from iter_json_records().
+        """
+        now = now or datetime.now(timezone.utc)
+        tracked_fields = list(dict.fromkeys(list(required_fields) + OPTIONAL_FIELDS + ['lastUpdated', 'checksum']))
+        required = set(required_fields)
+        missing = dict.fromkeys(tracked_fields, 0)
+        age_buckets = dict.fromkeys(AGE_BUCKETS, 0)
+        month_diffs = {}
+        total = 0
         valid_count = 0
         old_content_count = 0
-        missing_metadata = {
-            'lastUpdated': 0,
-            'checksum': 0,
-            'sourceUrl': 0,
-            'firstSeen': 0
-        }
-        
+
         for ref in references:
-            validation = self.validate_metadata(ref)
-            if validation['valid']:
+            total += 1
+            is_valid = True
+            for field in tracked_fields:
+                value = ref.get(field)
+                if value is None or (field in required and not value):
+                    missing[field] += 1
+                    if field in required:
+                        is_valid = False
+            if is_valid:
                 valid_count += 1
-            
-            # Check for old content
-            if 'lastUpdated' in ref and self.is_content_old(ref['lastUpdated']):
+
+            last_updated = ref.get('lastUpdated')
+            if not last_updated:
+                continue
+            if last_updated not in month_diffs:
+                try:
+                    dt = datetime.fromisoformat(last_updated.replace('Z', '+00:00'))
+                    month_diffs[last_updated] = (now.year - dt.year) * 12 + now.month - dt.month
+                except (AttributeError, ValueError):
+                    month_diffs[last_updated] = None
+            month_diff = month_diffs[last_updated]
+
+            if month_diff is None:
+                age_buckets['unparseable'] += 1
+                continue
+            if month_diff >= months:
                 old_content_count += 1
-            
-            # Track missing fields
-            for field in missing_metadata:
-                if field not in ref:
-                    missing_metadata[field] += 1
+            if month_diff < 1:
+                age_buckets['<1 month'] += 1
+            elif month_diff < 6:
+                age_buckets['1-5 months'] += 1
+            elif month_diff < 12:
+                age_buckets['6-11 months'] += 1
+            else:
+                age_buckets['12+ months'] += 1
+
+        return {
+            'generatedAt': now.isoformat(),
+            'total': total,
+            'valid': valid_count,
+            'invalid': total - valid_count,
+            'validPercent': round(valid_count / total * 100, 1) if total else None,
+            'oldContent': old_content_count,
+            'oldContentMonths': months,
+            'ageBuckets': age_buckets,
+            'missingFields': {field: count for field, count in missing.items() if count}
+        }
+    
+    def generate_metadata_report(self, references: List[Dict]) -> str:
+        """Generate a report on metadata completeness."""
+        summary = self.validate_batch(references)
+        
+        report = []
+        report.append("Metadata Validation Report")
+        report.append("=" * 40)
         
-        report.append(f"\nTotal References: {total}")
-        report.append(f"Valid References: {valid_count} ({valid_count/total*100:.1f}%)")
-        report.append(f"Old Content (>6 months): {old_content_count}")
+        report.append(f"\nTotal References: {summary['total']}")
+        if summary['total']:
+            report.append(f"Valid References: {summary['valid']} ({summary['validPercent']:.1f}%)")
+        else:
+            report.append("Valid References: 0")
+        report.append(f"Old Content (>6 months): {summary['oldContent']}")
         
         report.append("\nMissing Metadata Fields:")
-        for field, count in missing_metadata.items():
+        for field in ('lastUpdated', 'checksum', 'sourceUrl', 'firstSeen'):
+            count = summary['missingFields'].get(field, 0)
             if count > 0:
                 report.append(f"  - {field}: {count} references")
         
-        return '\n'.join(report)
\ No newline at end of file
+        return '\n'.join(report)
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Validate reference metadata and emit a machine-readable report')
+    parser.add_argument('--input-file', default='../src/data/generated/html_content_parsed.json',
+                        help='Parsed output, content history or JSON Lines file to validate')
+    parser.add_argument('--history', action='store_true',
+                        help='Validate content history entries, which have no content field')
+    parser.add_argument('--months', type=int, default=6,
+                        help='Age in months after which content counts as old')
+    parser.add_argument('--max-invalid', type=int, default=None,
+                        help='Fail if more references than this are invalid')
+    parser.add_argument('--max-old', type=int, default=None,
+                        help='Fail if more references than this are old')
+    parser.add_argument('--report-file', default=None,
+                        help='Also write the JSON report to this file')
+    args = parser.parse_args()
+
+    required_fields = HISTORY_REQUIRED_FIELDS if args.history else REQUIRED_FIELDS
+    summary = MetadataManager().validate_batch(
+        iter_json_records(args.input_file), args.months, required_fields)
+
+    failures = []
+    if args.max_invalid is not None and summary['invalid'] > args.max_invalid:
+        failures.append(f"{summary['invalid']} invalid references (max {args.max_invalid})")
+    if args.max_old is not None and summary['oldContent'] > args.max_old:
+        failures.append(f"{summary['oldContent']} old references (max {args.max_old})")
+    summary['passed'] = not failures
+    summary['failures'] = failures
+
+    report_json = json.dumps(summary, ensure_ascii=False, indent=2)
+    print(report_json)
+    if args.report_file:
+        with open(args.report_file, 'w', encoding='utf-8') as f:
+            f.write(report_json)
+
+    sys.exit(0 if summary['passed'] else 1)
+
+
+if __name__ == "__main__":
+    main()
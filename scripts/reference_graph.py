@@ -0,0 +1,142 @@
+#!/usr/bin/env python3
+"""
+Reference graph - resolves cross-references between law articles into an adjacency list.
+"""
+
+import re
+from collections import deque
+from typing import Callable, Dict, Iterable, List, Optional
+
+from amendment_notes import fold_turkish
+from impact_index import extract_references
+
+# Law numbers and names as they appear in article text, mapped to our law codes
+LAW_NUMBERS = {
+    '5271': 'CMK',
+    '5237': 'TCK',
+    '2559': 'PVSK',
+    '2863': '2863SK',
+    '6136': '6136SK',
+    '6713': '6713SK',
+}
+LAW_NAMES = {
+    'ceza muhakemesi kanun': 'CMK',
+    'türk ceza kanun': 'TCK',
+    'polis vazife ve salahiyet kanun': 'PVSK',
+}
+
+ORDINALS = {
+    'birinci': 1, 'ikinci': 2, 'üçüncü': 3, 'dördüncü': 4, 'beşinci': 5,
+    'altıncı': 6, 'yedinci': 7, 'sekizinci': 8, 'dokuzuncu': 9, 'onuncu': 10,
+}
+FOLDED_ORDINALS = {fold_turkish(word): value for word, value in ORDINALS.items()}
+
+# "91 inci maddenin dördüncü fıkrası", "135 inci maddesi", "(4) numaralı fıkrası", "ek 6 ncı maddesi"
+ARTICLE_REFERENCE_PATTERN = re.compile(
+    r'(?:\b(ek|geç[iİı]c[iİı])\s+)?(?<![\d/])(\d+)\s*[\'’]?\s*(?:inci|ıncı|uncu|üncü|nci|ncı|ncu|ncü)\s+madde\w*'
+    r'(?:\s+(?:(on\s+)?(' + '|'.join(ORDINALS) + r')|\((\d+)\)\s+numaralı)\s+fıkra)?',
+    re.IGNORECASE | re.UNICODE
+)
+# "5271 sayılı ... Kanunun", "Türk Ceza Kanununun", "bu Kanunun"
+# Each law name gets its own named group, so the match maps to a code without
+# lowercasing Turkish capitals ("MUHAKEMESİ".lower() keeps a combining dot)
+LAW_NAME_GROUPS = {f"law{i}": code for i, code in enumerate(LAW_NAMES.values())}
+LAW_MENTION_PATTERN = re.compile(
+    r'(?P<number>\d{4})\s+sayılı|' +
+    '|'.join(f"(?P<law{i}>{re.escape(name)})" for i, name in enumerate(LAW_NAMES)) +
+    r'|\b(?P<own>bu|aynı)\s+kanun',
+    re.IGNORECASE | re.UNICODE
+)
+# A law mention only carries over within the same clause
+CLAUSE_BREAK_PATTERN = re.compile(r';|\n|\.\s')
+
+
+def _referenced_law(text: str, position: int, law_code: str) -> Optional[str]:
+    """Find the law a reference at position belongs to, or None for laws we do not track."""
+    clause_start = 0
+    for match in CLAUSE_BREAK_PATTERN.finditer(text, 0, position):
+        clause_start = match.end()
+
+    referenced = law_code
+    for match in LAW_MENTION_PATTERN.finditer(text, clause_start, position):
+        if match.lastgroup == 'number':
+            referenced = LAW_NUMBERS.get(match.group('number'))
+        elif match.lastgroup in LAW_NAME_GROUPS:
+            referenced = LAW_NAME_GROUPS[match.lastgroup]
+        else:
+            referenced = law_code
+    return referenced
+
+
+def find_article_references(text: str, law_code: str) -> List[str]:
+    """Find the article keys referred to in an article text."""
+    references = extract_references(text)
+
+    for match in ARTICLE_REFERENCE_PATTERN.finditer(text):
+        referenced_law = _referenced_law(text, match.start(), law_code)
+        if referenced_law is None:
+            continue
+        article_id = match.group(2)
+        if match.group(1):
+            # Named like parse_law_articles names additional and provisional articles
+            prefix = 'EK' if fold_turkish(match.group(1)) == 'ek' else 'Geçici'
+            article_id = f"{prefix} {article_id}"
+        if match.group(4):
+            sub_num = FOLDED_ORDINALS[fold_turkish(match.group(4))] + (10 if match.group(3) else 0)
+            article_id = f"{article_id}/{sub_num}"
+        elif match.group(5):
+            article_id = f"{article_id}/{match.group(5)}"
+        key = f"{referenced_law} {article_id}"
+        if key not in references:
+            references.append(key)
+
+    return references
+
+
+def resolve_reference(key: str, known: Callable[[str], bool]) -> Optional[str]:
+    """Resolve a key to a known article, falling back to its main article."""
+    if known(key):
+        return key
+    main_key = key.split('/', 1)[0]
+    if main_key != key and known(main_key):
+        return main_key
+    return None
+
+
+def build_reference_graph(articles: Dict[str, Dict]) -> Dict[str, List[str]]:
+    """Build the adjacency list between the given articles, keyed like the parsed output."""
+    graph = {}
+    for key in sorted(articles):
+        article = articles[key]
+        neighbours = []
+        for reference in find_article_references(article['content'], article['code']):
+            resolved = resolve_reference(reference, articles.__contains__)
+            if resolved and resolved != key and resolved not in neighbours:
+                neighbours.append(resolved)
+        if neighbours:
+            graph[key] = neighbours
+    return graph
+
+
+def expand_targets(targets: Iterable[str], lookup: Callable[[str], Optional[Dict]],
+                   depth: int) -> List[str]:
+    """Add the articles referenced by the targets, transitively up to depth hops."""
+    expanded = list(targets)
+    seen = set(expanded)
+    queue = deque((key, 0) for key in expanded)
+
+    while queue:
+        key, hops = queue.popleft()
+        if hops >= depth:
+            continue
+        article = lookup(key)
+        if article is None:
+            continue
+        for reference in find_article_references(article['content'], article['code']):
+            resolved = resolve_reference(reference, lambda candidate: lookup(candidate) is not None)
+            if resolved and resolved not in seen:
+                seen.add(resolved)
+                expanded.append(resolved)
+                queue.append((resolved, hops + 1))
+
+    return expanded
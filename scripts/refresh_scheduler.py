@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+"""
+Refresh scheduler - plans which laws to rescrape from how often their tracked content actually changes.
+"""
+
+import argparse
+import json
+import math
+import os
+from datetime import datetime, timezone
+from typing import Dict, List, Optional
+
+from content_tracker import ContentTracker
+
+# Prior belief of one change per year, so laws with little history are still checked
+PRIOR_CHANGES = 1.0
+PRIOR_DAYS = 365.0
+
+
+def parse_timestamp(timestamp: str) -> Optional[datetime]:
+    """Parse an ISO timestamp as an aware UTC datetime."""
+    try:
+        dt = datetime.fromisoformat(timestamp.replace('Z', '+00:00'))
+    except (AttributeError, ValueError):
+        return None
+    if dt.tzinfo is None:
+        dt = dt.replace(tzinfo=timezone.utc)
+    return dt
+
+
+def last_success_time(entry: Dict) -> Optional[str]:
+    """Get when a law was last scraped successfully from its scraping metadata entry."""
+    if entry.get('status', 'success' if entry.get('success') else '') == 'success':
+        return entry.get('scraped_at')
+    return entry.get('lastSuccessAt')
+
+
+class RefreshScheduler:
+    def __init__(self, tracker: ContentTracker,
+                 metadata_file: str = "../src/data/laws_content/scraping_metadata.json"):
+        self.tracker = tracker
+        self.metadata_file = metadata_file
+
+    def _load_last_checks(self) -> Dict[str, datetime]:
+        """Load the last successful scrape time of each law."""
+        if not os.path.exists(self.metadata_file):
+            return {}
+        try:
+            with open(self.metadata_file, 'r', encoding='utf-8') as f:
+                metadata = json.load(f)
+        except (OSError, ValueError):
+            return {}
+
+        last_checks = {}
+        for entry in metadata.get('laws_scraped', []):
+            checked_at = parse_timestamp(last_success_time(entry) or '')
+            if checked_at:
+                last_checks[entry['law_code']] = checked_at
+        return last_checks
+
+    def estimate_change_rates(self, now: Optional[datetime] = None) -> Dict[str, float]:
+        """Estimate changes per day for each law from its modification history."""
+        now = now or datetime.now(timezone.utc)
+        first_seen = {}
+        change_days = {}
+
+        for entry in self.tracker.history.values():
+            code = entry.get('code')
+            if not code:
+                continue
+            seen = parse_timestamp(entry.get('firstSeen', ''))
+            if seen and (code not in first_seen or seen < first_seen[code]):
+                first_seen[code] = seen
+
+            # One amendment touches many articles at once, so count distinct days
+            days = change_days.setdefault(code, set())
+            previous = entry.get('previous_checksums', [])
+            if previous:
+                timestamps = [p.get('lastUpdated', '') for p in previous[1:]]
+                timestamps.append(entry.get('lastUpdated', ''))
+                days.update(t[:10] for t in timestamps if t)
+
+        rates = {}
+        for code, seen in first_seen.items():
+            span_days = max((now - seen).total_seconds() / 86400, 0)
+            rates[code] = (len(change_days.get(code, ())) + PRIOR_CHANGES) / (span_days + PRIOR_DAYS)
+        return rates
+
+    def plan(self, law_codes: List[str], budget: int, now: Optional[datetime] = None) -> List[Dict]:
+        """Rank laws by the probability they changed since the last check and keep the top `budget`."""
+        now = now or datetime.now(timezone.utc)
+        rates = self.estimate_change_rates(now)
+        last_checks = self._load_last_checks()
+
+        candidates = []
+        for code in law_codes:
+            rate = rates.get(code, PRIOR_CHANGES / PRIOR_DAYS)
+            checked_at = last_checks.get(code)
+            if checked_at is None:
+                probability = 1.0
+                days_since_check = None
+            else:
+                days_since_check = max((now - checked_at).total_seconds() / 86400, 0)
+                # Changes modelled as a Poisson process
+                probability = 1 - math.exp(-rate * days_since_check)
+            candidates.append({
+                'law_code': code,
+                'changesPerYear': round(rate * 365, 2),
+                'daysSinceCheck': None if days_since_check is None else round(days_since_check, 1),
+                'changeProbability': round(probability, 4)
+            })
+
+        candidates.sort(key=lambda c: (-c['changeProbability'], c['law_code']))
+        return candidates[:max(budget, 0)]
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        description='Plan which laws to refresh within a fetch budget')
+    parser.add_argument('--budget', type=int, default=3,
+                        help='Maximum number of laws to fetch')
+    parser.add_argument('--history-file', default='../src/data/generated/law_content_history.json',
+                        help='Content history file')
+    parser.add_argument('--metadata-file', default='../src/data/laws_content/scraping_metadata.json',
+                        help='Scraping metadata file')
+    args = parser.parse_args()
+
+    tracker = ContentTracker(history_file=args.history_file)
+    scheduler = RefreshScheduler(tracker, args.metadata_file)
+    law_codes = sorted({entry['code'] for entry in tracker.history.values() if 'code' in entry})
+
+    print(f"Refresh plan (budget {args.budget}):")
+    for candidate in scheduler.plan(law_codes, args.budget):
+        days = candidate['daysSinceCheck']
+        print(f"  - {candidate['law_code']}: P(changed)={candidate['changeProbability']:.2f}, "
+              f"{candidate['changesPerYear']} changes/year, "
+              f"last checked {'never' if days is None else f'{days} days ago'}")
+
+
+if __name__ == "__main__":
+    main()
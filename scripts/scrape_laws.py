@@ -1,8 +1,18 @@
 #!/usr/bin/env python3
+import io
 import os
 import time
 import json
+import random
+import argparse
+from collections import deque
 from datetime import datetime
+from urllib.parse import urlparse
+from atomic_io import write_json_if_changed
+from html_archive import HtmlArchive
+from law_parser import parse_law_articles
+from content_tracker import ContentTracker
+from refresh_scheduler import RefreshScheduler, last_success_time
 from selenium import webdriver
 from selenium.webdriver.chrome.options import Options
 from selenium.webdriver.chrome.service import Service
@@ -23,13 +33,75 @@ URLS = {
 # Create output directory
 OUTPUT_DIR = "../src/data/laws_content"
 os.makedirs(OUTPUT_DIR, exist_ok=True)
+METADATA_FILE = os.path.join(OUTPUT_DIR, "scraping_metadata.json")
+ARCHIVE_DIR = "../src/data/laws_archive"
+CHROMEDRIVER_PATH = "/opt/homebrew/bin/chromedriver"
+PAGE_LOAD_TIMEOUT_SECONDS = 10
 
+# Retry and politeness settings
+MAX_ATTEMPTS = 4
+BACKOFF_BASE_SECONDS = 2.0
+BACKOFF_MAX_SECONDS = 60.0
+REQUESTS_PER_SECOND = 0.5
+BURST_SIZE = 1
 
-def scrape_law_content(url, file_name):
+# Laws left out of a budgeted refresh are skipped, which completes the run just like a success
+DONE_STATUSES = ('success', 'skipped')
+
+
+class TokenBucket:
+    """Politeness limiter allowing `rate` requests per second with bursts of `capacity`."""
+
+    def __init__(self, rate, capacity):
+        self.rate = rate
+        self.capacity = capacity
+        self.tokens = capacity
+        self.updated_at = time.monotonic()
+
+    def acquire(self):
+        while True:
+            now = time.monotonic()
+            self.tokens = min(self.capacity, self.tokens +
+                              (now - self.updated_at) * self.rate)
+            self.updated_at = now
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return
+            time.sleep((1 - self.tokens) / self.rate)
+
+
+class HostBackoff:
+    """Exponential backoff with jitter, tracked separately for each host."""
+
+    def __init__(self, base=BACKOFF_BASE_SECONDS, maximum=BACKOFF_MAX_SECONDS):
+        self.base = base
+        self.maximum = maximum
+        self.failures = {}
+        self.not_before = {}
+
+    def wait(self, host):
+        delay = self.not_before.get(host, 0) - time.monotonic()
+        if delay > 0:
+            print(f"Backing off {delay:.1f}s for {host}")
+            time.sleep(delay)
+
+    def record_success(self, host):
+        self.failures.pop(host, None)
+        self.not_before.pop(host, None)
+
+    def record_failure(self, host):
+        failures = self.failures.get(host, 0) + 1
+        self.failures[host] = failures
+        delay = min(self.maximum, self.base * 2 ** (failures - 1))
+        self.not_before[host] = time.monotonic() + random.uniform(delay / 2, delay)
+
+
+def scrape_law_content(url, file_name, output_dir=OUTPUT_DIR, archive_dir=ARCHIVE_DIR):
     print(f"Scraping {file_name} from {url}")
     
     # Capture scraping timestamp
     scrape_timestamp = datetime.utcnow().isoformat() + 'Z'
+    started = time.monotonic()
 
     # Setup Chrome options
     chrome_options = Options()
@@ -38,16 +110,17 @@ def scrape_law_content(url, file_name):
     chrome_options.add_argument("--no-sandbox")
     chrome_options.add_argument("--disable-dev-shm-usage")
 
-    # Initialize the driver with system ChromeDriver
-    service = Service('/opt/homebrew/bin/chromedriver')
-    driver = webdriver.Chrome(service=service, options=chrome_options)
-
+    driver = None
     try:
+        # Initialize the driver with system ChromeDriver, a failed start counts as a failed attempt
+        service = Service(CHROMEDRIVER_PATH)
+        driver = webdriver.Chrome(service=service, options=chrome_options)
+
         # Load the page
         driver.get(url)
 
         # Wait for the iframe to load
-        WebDriverWait(driver, 10).until(
+        WebDriverWait(driver, PAGE_LOAD_TIMEOUT_SECONDS).until(
             EC.presence_of_element_located((By.TAG_NAME, "iframe"))
         )
 
@@ -56,7 +129,7 @@ def scrape_law_content(url, file_name):
         driver.switch_to.frame(iframe)
 
         # Wait for content to load inside iframe
-        WebDriverWait(driver, 10).until(
+        WebDriverWait(driver, PAGE_LOAD_TIMEOUT_SECONDS).until(
             EC.presence_of_element_located((By.TAG_NAME, "body"))
         )
 
@@ -64,12 +137,21 @@ def scrape_law_content(url, file_name):
         content = driver.find_element(
             By.TAG_NAME, "body").get_attribute("innerHTML")
 
+        # An error or maintenance page in the iframe renders fine, so check the body
+        # with the parser itself: a page it finds no articles in is useless downstream
+        _, articles = parse_law_articles(io.StringIO(content), file_name)
+        if not articles:
+            raise ValueError("Page contains no law articles")
+
         # Save content to file
-        output_path = os.path.join(OUTPUT_DIR, f"{file_name}.html")
+        output_path = os.path.join(output_dir, f"{file_name}.html")
         with open(output_path, "w", encoding="utf-8") as f:
             f.write(content)
 
         print(f"Successfully saved {file_name} to {output_path}")
+
+        # Keep every distinct fetch in the compressed archive
+        digest = HtmlArchive(archive_dir).put(file_name, content, scrape_timestamp)
         
         # Return metadata for tracking
         return {
@@ -77,7 +159,9 @@ def scrape_law_content(url, file_name):
             'url': url,
             'scraped_at': scrape_timestamp,
             'success': True,
-            'file_path': output_path
+            'file_path': output_path,
+            'digest': digest,
+            'duration_seconds': round(time.monotonic() - started, 3)
         }
 
     except Exception as e:
@@ -87,34 +171,154 @@ def scrape_law_content(url, file_name):
             'url': url,
             'scraped_at': scrape_timestamp,
             'success': False,
-            'error': str(e)
+            'error': str(e),
+            'duration_seconds': round(time.monotonic() - started, 3)
         }
 
     finally:
         # Close the browser
-        driver.quit()
+        if driver is not None:
+            driver.quit()
+
+
+def load_checkpoint(metadata_file, fresh=False, urls=None):
+    """Load the previous scraping run, starting a new one if it completed or fresh is set."""
+    checkpoint = None
+    if os.path.exists(metadata_file):
+        try:
+            with open(metadata_file, "r", encoding="utf-8") as f:
+                checkpoint = json.load(f)
+        except (OSError, ValueError):
+            checkpoint = None
+
+    previous = {}
+    if checkpoint:
+        previous = {entry['law_code']: entry
+                    for entry in checkpoint.get('laws_scraped', [])}
+
+    # Start over when asked to or when the last run completed
+    start_over = fresh or not previous or all(
+        entry.get('status') in DONE_STATUSES for entry in previous.values())
+
+    laws = {}
+    for law_code, url in (urls or URLS).items():
+        entry = previous.get(law_code, {})
+        if not start_over and entry.get('status') in DONE_STATUSES and entry.get('url') == url:
+            laws[law_code] = entry
+        else:
+            laws[law_code] = {
+                'law_code': law_code,
+                'url': url,
+                'status': 'pending',
+                'attempts': 0
+            }
+            # Keep the last successful scrape for the refresh scheduler
+            last_success = last_success_time(entry)
+            if last_success:
+                laws[law_code]['lastSuccessAt'] = last_success
+
+    return {
+        'scraping_run': datetime.utcnow().isoformat() + 'Z' if start_over else checkpoint['scraping_run'],
+        'laws': laws
+    }
+
+
+def save_checkpoint(metadata_file, checkpoint):
+    """Persist scraping progress so an interrupted run can resume."""
+    write_json_if_changed(metadata_file, {
+        'scraping_run': checkpoint['scraping_run'],
+        'laws_scraped': list(checkpoint['laws'].values())
+    })
+
+
+def run_scraping(metadata_file=METADATA_FILE, fresh=False, max_attempts=MAX_ATTEMPTS,
+                 only=None, urls=None, output_dir=OUTPUT_DIR, archive_dir=ARCHIVE_DIR,
+                 rate=REQUESTS_PER_SECOND):
+    """Scrape all pending or failed laws (or just those in only, skipping the rest), retrying with per-host backoff."""
+    checkpoint = load_checkpoint(metadata_file, fresh, urls)
+    laws = checkpoint['laws']
+
+    pending = deque()
+    for code, entry in laws.items():
+        if entry.get('status') in DONE_STATUSES:
+            continue
+        if only is None or code in only:
+            pending.append(code)
+        else:
+            entry['status'] = 'skipped'
+    save_checkpoint(metadata_file, checkpoint)
+
+    already_scraped = sum(1 for entry in laws.values() if entry.get('status') == 'success')
+    if already_scraped:
+        print(f"Resuming run {checkpoint['scraping_run']}: "
+              f"{already_scraped} laws already scraped, {len(pending)} remaining")
+
+    bucket = TokenBucket(rate, BURST_SIZE)
+    backoff = HostBackoff()
+
+    while pending:
+        law_code = pending.popleft()
+        entry = laws[law_code]
+        host = urlparse(entry['url']).netloc
+
+        backoff.wait(host)
+        bucket.acquire()
+
+        metadata = scrape_law_content(entry['url'], law_code, output_dir, archive_dir)
+        attempts = entry.get('attempts', 0) + 1
+        metadata['attempts'] = attempts
+
+        if metadata['success']:
+            metadata['status'] = 'success'
+            backoff.record_success(host)
+        else:
+            metadata['status'] = 'failed'
+            if entry.get('lastSuccessAt'):
+                metadata['lastSuccessAt'] = entry['lastSuccessAt']
+            backoff.record_failure(host)
+            if attempts < max_attempts:
+                pending.append(law_code)
+            else:
+                print(f"Giving up on {law_code} after {attempts} attempts")
+
+        laws[law_code] = metadata
+        save_checkpoint(metadata_file, checkpoint)
+
+    return checkpoint
 
 
 def main():
-    scraping_metadata = []
-    
-    for law_code, url in URLS.items():
-        metadata = scrape_law_content(url, law_code)
-        if metadata:
-            scraping_metadata.append(metadata)
-        # Add a small delay between requests to avoid overloading the server
-        time.sleep(2)
-    
-    # Save scraping metadata
-    metadata_file = os.path.join(OUTPUT_DIR, "scraping_metadata.json")
-    with open(metadata_file, "w", encoding="utf-8") as f:
-        json.dump({
-            'scraping_run': datetime.utcnow().isoformat() + 'Z',
-            'laws_scraped': scraping_metadata
-        }, f, ensure_ascii=False, indent=2)
-    
+    parser = argparse.ArgumentParser(
+        description='Scrape law content, resuming from the last checkpoint')
+    parser.add_argument('--fresh', action='store_true',
+                        help='Ignore the checkpoint and scrape all laws again')
+    parser.add_argument('--max-attempts', type=int, default=MAX_ATTEMPTS,
+                        help='Maximum attempts per law')
+    parser.add_argument('--budget', type=int, default=None,
+                        help='Only fetch the laws most likely to have changed, up to this many')
+    parser.add_argument('--history-file', default='../src/data/generated/law_content_history.json',
+                        help='Content history used to plan a budgeted refresh')
+    args = parser.parse_args()
+
+    only = None
+    fresh = args.fresh
+    if args.budget is not None:
+        scheduler = RefreshScheduler(ContentTracker(history_file=args.history_file), METADATA_FILE)
+        plan = scheduler.plan(list(URLS), args.budget)
+        only = [candidate['law_code'] for candidate in plan]
+        # Each budgeted refresh is its own run
+        fresh = True
+        print(f"Refresh plan: {', '.join(only) or 'nothing to fetch'}")
+
+    checkpoint = run_scraping(fresh=fresh, max_attempts=args.max_attempts, only=only)
+
+    failed = [code for code, entry in checkpoint['laws'].items()
+              if entry.get('status') == 'failed']
+
     print("Scraping completed!")
-    print(f"Metadata saved to {metadata_file}")
+    if failed:
+        print(f"Failed laws (rerun to resume): {', '.join(failed)}")
+    print(f"Metadata saved to {METADATA_FILE}")
 
 
 if __name__ == "__main__":